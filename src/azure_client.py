@@ -0,0 +1,410 @@
+"""
+Azure Resource Manager client using direct REST calls
+Reuses one pooled HTTP session and one ARM token (acquired via Azure CLI) for all requests
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from logger import get_logger
+
+try:
+    import fcntl
+except ImportError:
+    # Not available on Windows; the token cache then works without cross-process locking
+    fcntl = None
+
+
+ARM_ENDPOINT = "https://management.azure.com"
+ARM_RESOURCE = "https://management.azure.com/"
+SUBSCRIPTIONS_API_VERSION = "2022-12-01"
+RESOURCE_GROUPS_API_VERSION = "2021-04-01"
+BATCH_API_VERSION = "2020-06-01"
+RESOURCE_GRAPH_API_VERSION = "2021-03-01"
+
+# Maximum number of sub-requests ARM accepts in a single $batch call
+BATCH_MAX_REQUESTS = 20
+
+# Maximum number of subscriptions in one Resource Graph query, and rows per result page
+RESOURCE_GRAPH_MAX_SUBSCRIPTIONS = 1000
+RESOURCE_GRAPH_PAGE_SIZE = 1000
+
+RESOURCE_GROUPS_GRAPH_QUERY = (
+    "ResourceContainers"
+    " | where type =~ 'microsoft.resources/subscriptions/resourcegroups'"
+    " | project subscriptionId, name"
+    " | order by subscriptionId asc, name asc"
+)
+
+# Refresh the token this many seconds before it actually expires
+TOKEN_REFRESH_MARGIN = 300
+
+# On-disk token cache shared by all runs on the same machine (e.g. parallel pipeline jobs)
+TOKEN_CACHE_DIR = Path.home() / '.cache' / 'aztfexport-helper'
+TOKEN_CACHE_FILE = TOKEN_CACHE_DIR / 'arm_token.json'
+TOKEN_CACHE_LOCK = TOKEN_CACHE_DIR / 'arm_token.lock'
+
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Get or create the shared HTTP session (keep-alive, pooled connections, retries)"""
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            # POST is only used for read-only $batch and Resource Graph requests, so it is safe to retry
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=True
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        _session = requests.Session()
+        _session.mount('https://', adapter)
+    return _session
+
+
+def _az_config_dir() -> str:
+    """Azure CLI configuration directory (honours AZURE_CONFIG_DIR)"""
+    return os.getenv('AZURE_CONFIG_DIR') or os.path.join(os.path.expanduser('~'), '.azure')
+
+
+def _cli_profile_tenants() -> Set[str]:
+    """Tenant IDs of the subscriptions in the Azure CLI profile (empty if it can't be read)"""
+    try:
+        # azureProfile.json is written with a UTF-8 BOM
+        with open(os.path.join(_az_config_dir(), 'azureProfile.json'), encoding='utf-8-sig') as f:
+            profile = json.load(f)
+    except (OSError, ValueError):
+        return set()
+    return {sub.get('tenantId') for sub in profile.get('subscriptions') or [] if sub.get('tenantId')}
+
+
+def _token_cache_key() -> Optional[str]:
+    """Identify the current Azure CLI login for the on-disk token cache
+
+    The key combines the CLI config directory with the modification time of its
+    azureProfile.json, which changes on every az login / az account set, so a
+    cached token is never reused for a different identity.
+    """
+    config_dir = _az_config_dir()
+    try:
+        profile_mtime = os.stat(os.path.join(config_dir, 'azureProfile.json')).st_mtime_ns
+    except OSError:
+        return None
+    return f"{os.path.abspath(config_dir)}:{profile_mtime}"
+
+
+class AzureClient:
+    """Lists Azure subscriptions and resource groups via the ARM REST API"""
+
+    def __init__(self, az_cli_path: str = 'az', token_cache: bool = False):
+        """Initialize Azure client
+
+        Args:
+            az_cli_path: Azure CLI executable, used only to acquire the ARM access token
+            token_cache: Share the ARM access token with other runs via an on-disk cache
+        """
+        self.logger = get_logger()
+        self.az_cli_path = az_cli_path
+        self.token_cache = token_cache
+        self._token: Optional[str] = None
+        self._token_expires_on: float = 0.0
+        self._token_lock = threading.Lock()
+
+    def _get_token(self) -> str:
+        """Get ARM access token, reusing the cached one until shortly before it expires"""
+        with self._token_lock:
+            if self._token and self._token_expires_on - time.time() > TOKEN_REFRESH_MARGIN:
+                return self._token
+            if self.token_cache:
+                self._token, self._token_expires_on = self._get_token_from_disk_cache()
+            else:
+                self._token, self._token_expires_on = self._acquire_token()
+            return self._token
+
+    def _acquire_token(self) -> Tuple[str, float]:
+        """Acquire a new ARM access token from Azure CLI
+
+        Returns:
+            Tuple of (access token, expiry as POSIX timestamp)
+        """
+        result = subprocess.run(
+            [
+                self.az_cli_path, 'account', 'get-access-token',
+                '--resource', ARM_RESOURCE,
+                '--query', '{accessToken:accessToken, expiresOn:expiresOn, expires_on:expires_on}',
+                '--output', 'json'
+            ],
+            capture_output=True,
+            timeout=30,
+            check=True
+        )
+        # Parse the raw bytes; json handles UTF-8 input without a separate decode step
+        token_data = json.loads(result.stdout)
+
+        if token_data.get('expires_on'):
+            # Newer Azure CLI versions return a POSIX timestamp
+            expires_on = float(token_data['expires_on'])
+        else:
+            # Older versions only return local time, e.g. "2024-01-01 12:00:00.000000"
+            expires_on = datetime.fromisoformat(token_data['expiresOn']).timestamp()
+
+        self.logger.debug("Acquired ARM access token")
+        return token_data['accessToken'], expires_on
+
+    def _get_token_from_disk_cache(self) -> Tuple[str, float]:
+        """Get ARM access token from the on-disk cache, refreshing it via Azure CLI if needed
+
+        The cache file is only readable by the current user and is rewritten atomically;
+        an exclusive lock (where supported) keeps parallel jobs from refreshing at once.
+        Any cache problem falls back to acquiring a token directly.
+        """
+        cache_key = _token_cache_key()
+        if cache_key is None:
+            return self._acquire_token()
+
+        try:
+            TOKEN_CACHE_DIR.mkdir(parents=True, exist_ok=True, mode=0o700)
+            lock_file = open(TOKEN_CACHE_LOCK, 'a')
+        except OSError as e:
+            self.logger.debug(f"Token cache unavailable: {str(e)}")
+            return self._acquire_token()
+
+        with lock_file:
+            if fcntl:
+                # Released when the lock file is closed
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+            now = time.time()
+            try:
+                with open(TOKEN_CACHE_FILE, 'rb') as f:
+                    entries = json.loads(f.read())
+            except (OSError, ValueError):
+                entries = {}
+
+            entry = entries.get(cache_key)
+            if entry and entry.get('expiresOn', 0) - now > TOKEN_REFRESH_MARGIN:
+                self.logger.debug("Using cached ARM access token")
+                return entry['accessToken'], entry['expiresOn']
+
+            token, expires_on = self._acquire_token()
+
+            # Drop expired entries so the file doesn't grow across logins
+            entries = {key: value for key, value in entries.items() if value.get('expiresOn', 0) > now}
+            entries[cache_key] = {'accessToken': token, 'expiresOn': expires_on}
+            tmp_path = TOKEN_CACHE_FILE.with_suffix(f'.{os.getpid()}.tmp')
+            try:
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(entries, f)
+                os.replace(tmp_path, TOKEN_CACHE_FILE)
+            except OSError as e:
+                self.logger.debug(f"Could not write token cache: {str(e)}")
+
+            return token, expires_on
+
+    def _get_paged(self, path: str, api_version: str) -> Iterator[Dict[str, Any]]:
+        """GET an ARM collection, following nextLink pagination"""
+        return self._iter_pages(f"{ARM_ENDPOINT}{path}", {'api-version': api_version})
+
+    def _iter_pages(self, url: Optional[str], params: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """Yield items from an ARM collection URL and all of its nextLink pages"""
+        session = _get_session()
+
+        while url:
+            response = session.get(
+                url,
+                params=params,
+                headers={'Authorization': f"Bearer {self._get_token()}"},
+                timeout=30
+            )
+            response.raise_for_status()
+            page = json.loads(response.content)
+            yield from page.get('value', [])
+            # nextLink already carries api-version and continuation token
+            url = page.get('nextLink')
+            params = None
+
+    def list_subscriptions(self) -> List[Dict[str, Any]]:
+        """List all subscriptions accessible to the signed-in account
+
+        The ARM token is issued for the CLI's current tenant, so only that tenant's
+        subscriptions are listed (unlike `az account list`, which spans all tenants).
+        """
+        subscriptions = list(self._get_paged('/subscriptions', SUBSCRIPTIONS_API_VERSION))
+        tenants = _cli_profile_tenants()
+        if len(tenants) > 1:
+            self.logger.warning(
+                f"Azure CLI profile spans {len(tenants)} tenants; only subscriptions in the current "
+                "tenant are exported (run once per tenant with az account set)"
+            )
+        return subscriptions
+
+    def list_resource_groups(self, subscription_id: str) -> List[Dict[str, Any]]:
+        """List all resource groups in a subscription"""
+        return list(self._get_paged(f'/subscriptions/{subscription_id}/resourcegroups', RESOURCE_GROUPS_API_VERSION))
+
+    def resource_group_has_resources(self, subscription_id: str, resource_group: str) -> bool:
+        """Check whether a resource group contains at least one resource (fetches one item)"""
+        response = _get_session().get(
+            f"{ARM_ENDPOINT}/subscriptions/{subscription_id}/resourceGroups/{quote(resource_group, safe='')}/resources",
+            params={'api-version': RESOURCE_GROUPS_API_VERSION, '$top': '1'},
+            headers={'Authorization': f"Bearer {self._get_token()}"},
+            timeout=30
+        )
+        response.raise_for_status()
+        page = json.loads(response.content)
+        # A page can come back empty with a nextLink, which still means there is more to list
+        return bool(page.get('value') or page.get('nextLink'))
+    
+    def batch_list_resource_groups(self, subscription_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """List resource groups for up to BATCH_MAX_REQUESTS subscriptions per ARM $batch call
+
+        Collapses N per-subscription round trips into ceil(N/20) POSTs. Sub-requests that
+        did not succeed (e.g. throttled or forbidden) are left out of the result.
+
+        Returns:
+            Dict mapping subscription ID to its list of resource groups
+        """
+        session = _get_session()
+        results = {}
+
+        for start in range(0, len(subscription_ids), BATCH_MAX_REQUESTS):
+            chunk = subscription_ids[start:start + BATCH_MAX_REQUESTS]
+            payload = {
+                'requests': [
+                    {
+                        'httpMethod': 'GET',
+                        'name': subscription_id,
+                        'url': f"/subscriptions/{subscription_id}/resourcegroups?api-version={RESOURCE_GROUPS_API_VERSION}"
+                    }
+                    for subscription_id in chunk
+                ]
+            }
+            response = session.post(
+                f"{ARM_ENDPOINT}/batch",
+                params={'api-version': BATCH_API_VERSION},
+                json=payload,
+                headers={'Authorization': f"Bearer {self._get_token()}"},
+                timeout=60
+            )
+            response.raise_for_status()
+
+            for sub_response in json.loads(response.content).get('responses', []):
+                subscription_id = sub_response.get('name')
+                if sub_response.get('httpStatusCode') != 200 or subscription_id not in chunk:
+                    self.logger.debug(
+                        f"Batch resource group listing failed for {subscription_id} "
+                        f"(status: {sub_response.get('httpStatusCode')})"
+                    )
+                    continue
+                content = sub_response.get('content') or {}
+                rgs = list(content.get('value', []))
+                rgs.extend(self._iter_pages(content.get('nextLink')))
+                results[subscription_id] = rgs
+
+        return results
+
+    def graph_list_resource_groups(self, subscription_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """List resource groups for many subscriptions with Azure Resource Graph
+        
+        One paged query covers up to RESOURCE_GRAPH_MAX_SUBSCRIPTIONS subscriptions, so a
+        whole tenant usually takes a single round trip. Resource Graph is eventually
+        consistent, so groups created in the last few minutes may be missing.
+        
+        Returns:
+            Dict mapping every requested subscription ID to its list of resource groups
+            (ARM-style items with a 'name' key)
+        """
+        session = _get_session()
+        results = {subscription_id: [] for subscription_id in subscription_ids}
+        # Resource Graph may return subscription IDs in a different case
+        by_lower_id = {subscription_id.lower(): subscription_id for subscription_id in subscription_ids}
+        
+        for start in range(0, len(subscription_ids), RESOURCE_GRAPH_MAX_SUBSCRIPTIONS):
+            chunk = subscription_ids[start:start + RESOURCE_GRAPH_MAX_SUBSCRIPTIONS]
+            options = {'resultFormat': 'objectArray', '$top': RESOURCE_GRAPH_PAGE_SIZE}
+            while True:
+                response = session.post(
+                    f"{ARM_ENDPOINT}/providers/Microsoft.ResourceGraph/resources",
+                    params={'api-version': RESOURCE_GRAPH_API_VERSION},
+                    json={'subscriptions': chunk, 'query': RESOURCE_GROUPS_GRAPH_QUERY, 'options': options},
+                    headers={'Authorization': f"Bearer {self._get_token()}"},
+                    timeout=60
+                )
+                response.raise_for_status()
+                page = json.loads(response.content)
+                for row in page.get('data', []):
+                    subscription_id = by_lower_id.get((row.get('subscriptionId') or '').lower())
+                    if subscription_id and row.get('name'):
+                        results[subscription_id].append({'name': row['name']})
+                skip_token = page.get('$skipToken')
+                if not skip_token:
+                    break
+                options = {**options, '$skipToken': skip_token}
+        
+        return results
+    
+    def get_resource_groups_bulk(self, subscription_ids: List[str], max_workers: int = 8) -> Dict[str, List[Dict[str, Any]]]:
+        """List resource groups for many subscriptions concurrently
+
+        Subscriptions are grouped into $batch calls, which are fanned out over a bounded
+        thread pool sharing the pooled session, so throttled (429) responses are retried
+        with backoff rather than piling up. A batch that fails as a whole falls back to
+        one request per subscription. Subscriptions whose listing still fails are left
+        out of the result, so callers can fall back to a per-subscription call with full
+        error reporting.
+
+        Returns:
+            Dict mapping subscription ID to its list of resource groups
+        """
+        if not subscription_ids:
+            return {}
+
+        # Acquire the token up front so workers don't race to refresh it
+        self._get_token()
+
+        def list_one(subscription_id: str) -> Optional[List[Dict[str, Any]]]:
+            try:
+                return self.list_resource_groups(subscription_id)
+            except Exception as e:
+                self.logger.debug(f"Resource group listing failed for {subscription_id}: {str(e)}")
+                return None
+
+        def list_chunk(chunk: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+            try:
+                listed = self.batch_list_resource_groups(chunk)
+            except Exception as e:
+                self.logger.debug(f"Batch resource group listing failed, falling back to single requests: {str(e)}")
+                listed = {}
+            for subscription_id in chunk:
+                if subscription_id not in listed:
+                    rgs = list_one(subscription_id)
+                    if rgs is not None:
+                        listed[subscription_id] = rgs
+            return listed
+
+        chunks = [
+            subscription_ids[start:start + BATCH_MAX_REQUESTS]
+            for start in range(0, len(subscription_ids), BATCH_MAX_REQUESTS)
+        ]
+        results = {}
+        workers = max(1, min(max_workers, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for listed in executor.map(list_chunk, chunks):
+                results.update(listed)
+        return results
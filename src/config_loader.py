@@ -0,0 +1,96 @@
+"""
+Configuration loading with caching of parsed YAML files
+"""
+
+import copy
+import json
+import os
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+import yaml
+
+try:
+    # libyaml C parser - much faster than the pure-Python loader
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+
+def yaml_load(stream) -> Any:
+    """Safely parse YAML, using the libyaml C loader when available"""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+# Suffix of the JSON copy written next to each parsed YAML file
+JSON_CACHE_SUFFIX = '.cache.json'
+
+# Maximum number of parsed config files kept in memory
+CONFIG_CACHE_SIZE = 100
+
+# abspath -> ((mtime_ns, size), parsed config), least recently used first
+_config_cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+
+
+def _json_cache_header(signature: Tuple[int, int]) -> str:
+    return f"# source-mtime:{signature[0]} size:{signature[1]}\n"
+
+
+def _read_json_cache(path: str, signature: Tuple[int, int]) -> Optional[Dict[str, Any]]:
+    """Read the JSON copy of a YAML file if it was written for this version of the file"""
+    try:
+        with open(path + JSON_CACHE_SUFFIX, 'r', encoding='utf-8') as f:
+            if f.readline() != _json_cache_header(signature):
+                return None
+            return json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_cache(path: str, signature: Tuple[int, int], config: Dict[str, Any]) -> None:
+    """Write a JSON copy of a parsed YAML file; skipped when the directory isn't writable
+    
+    Configs that don't survive a JSON round trip unchanged (dates, non-string keys)
+    are not cached, so the YAML is always parsed for them.
+    """
+    try:
+        data = json.dumps(config)
+        if json.loads(data) != config:
+            return
+        tmp_path = f"{path}{JSON_CACHE_SUFFIX}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(_json_cache_header(signature))
+            f.write(data)
+        os.replace(tmp_path, path + JSON_CACHE_SUFFIX)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+def load_config(config_path: str) -> Dict[str, Any]:
+    """Load configuration from YAML file, reusing the parsed result while the file is unchanged
+    
+    Parsed configs are cached in memory and, across runs, as JSON next to the YAML file
+    (much faster to parse). Both are validated against the file's mtime and size.
+    Callers get a deep copy, so modifying the returned dict never affects later loads.
+    """
+    path = os.path.abspath(config_path)
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    
+    cached = _config_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        _config_cache.move_to_end(path)
+        return copy.deepcopy(cached[1])
+    
+    config = _read_json_cache(path, signature)
+    if config is None:
+        with open(path, 'r') as f:
+            config = yaml_load(f) or {}
+        _write_json_cache(path, signature, config)
+    
+    _config_cache[path] = (signature, config)
+    _config_cache.move_to_end(path)
+    while len(_config_cache) > CONFIG_CACHE_SIZE:
+        _config_cache.popitem(last=False)
+    
+    return copy.deepcopy(config)
@@ -3,16 +3,363 @@ Azure Resource Export Manager
 Uses aztfexport to export resources organized by subscription and resource group
 """
 
+import atexit
+import codecs
+import errno
 import os
 import platform
 import subprocess
+import shlex
 import shutil
+import string
+import sys
+import tempfile
+import threading
+import time
 import fnmatch
-import yaml
+import re
 import json
+import signal
+import requests
+from collections import OrderedDict
+from contextlib import nullcontext
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from logger import get_logger
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property, lru_cache
+from itertools import chain
+from typing import Callable, Dict, Any, Iterator, List, Optional, Set, TextIO, Tuple
+from azure_client import AzureClient, TOKEN_CACHE_DIR
+from config_loader import load_config
+from logger import get_logger, output_lock, set_log_level
+
+try:
+    import fcntl
+    import pty
+    import struct
+    import termios
+except ImportError:
+    # Not available on Windows; aztfexport then runs on plain pipes
+    pty = None
+
+
+class _SanitizeTable(dict):
+    """str.translate table keeping [a-zA-Z0-9_-] (lowercased) and mapping everything else to '_'"""
+    
+    def __missing__(self, codepoint: int) -> str:
+        return '_'
+
+
+# Translation table for export directory names; lowercases like the original
+# re.sub(...).lower(), which existing export directories and repo paths rely on
+_SANITIZE_TABLE = _SanitizeTable(
+    {ord(c): c.lower() for c in string.ascii_letters + string.digits + '_-'}
+)
+
+
+@lru_cache(maxsize=8192)
+def _sanitize_name(name: str) -> str:
+    """Sanitize name for filesystem (memoized; called several times per resource group)"""
+    return name.translate(_SANITIZE_TABLE)
+
+
+# Number of recent distinct output lines remembered for de-duplicating aztfexport output
+OUTPUT_DEDUP_MAX_LINES = 10000
+
+
+# ARM throttling errors as aztfexport (Azure SDK for Go) reports them; only checked once an
+# export has failed, since retrying wipes the output directory
+_THROTTLE_RE = re.compile(
+    r'StatusCode=429\b|RESPONSE 429\b|ERROR CODE: TooManyRequests\b|"code":\s*"TooManyRequests"'
+)
+
+# Resource group listings cached across runs (azure.resource_group_cache_ttl), one file
+# per subscription next to the token cache
+RESOURCE_GROUP_CACHE_DIR = TOKEN_CACHE_DIR
+
+# Environment passed to aztfexport when aztfexport.minimal_env is enabled: OS/user basics,
+# proxy and CA settings, and everything Azure/Terraform authentication may rely on
+_MINIMAL_ENV_NAMES = frozenset([
+    'PATH', 'HOME', 'USER', 'USERNAME', 'LOGNAME', 'SHELL', 'LANG', 'LC_ALL', 'LC_CTYPE', 'TZ',
+    'TMPDIR', 'TEMP', 'TMP',
+    'SYSTEMROOT', 'SYSTEMDRIVE', 'WINDIR', 'COMSPEC', 'PATHEXT',
+    'USERPROFILE', 'APPDATA', 'LOCALAPPDATA', 'PROGRAMDATA', 'PROGRAMFILES',
+    'HTTP_PROXY', 'HTTPS_PROXY', 'NO_PROXY', 'http_proxy', 'https_proxy', 'no_proxy',
+    'SSL_CERT_FILE', 'SSL_CERT_DIR', 'REQUESTS_CA_BUNDLE',
+    'GOPATH', 'GOROOT',
+    'IDENTITY_ENDPOINT', 'IDENTITY_HEADER', 'MSI_ENDPOINT', 'MSI_SECRET', 'IMDS_ENDPOINT',
+    'SYSTEM_OIDCREQUESTURI',
+])
+_MINIMAL_ENV_PREFIXES = ('AZURE_', 'ARM_', 'AZTFEXPORT_', 'TF_', 'ACTIONS_ID_TOKEN_REQUEST_')
+
+
+def _build_aztfexport_env(minimal: bool = False) -> Dict[str, str]:
+    """Build the environment for aztfexport processes
+    
+    By default the full environment is inherited; with minimal=True only the variables
+    aztfexport and its Azure/Terraform authentication can use are passed through.
+    """
+    if minimal:
+        env = {
+            name: value for name, value in os.environ.items()
+            if name in _MINIMAL_ENV_NAMES or name.upper() in _MINIMAL_ENV_NAMES
+            or name.startswith(_MINIMAL_ENV_PREFIXES)
+        }
+    else:
+        env = os.environ.copy()
+    env['AZTFEXPORT_NON_INTERACTIVE'] = 'true'
+    env['TERM'] = 'dumb'  # Set terminal type to dumb
+    env['NO_COLOR'] = '1'  # Disable color output
+    return env
+
+
+# Directories already created by this process (resolved paths); shared by the
+# subscription and resource group workers, so guarded by _created_dirs_lock
+_created_dirs: Set[Path] = set()
+_created_dirs_lock = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> Path:
+    """Create a directory (and parents) once per process; returns the resolved path"""
+    path = path.resolve()
+    with _created_dirs_lock:
+        if path not in _created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            _created_dirs.add(path)
+    return path
+
+
+def _forget_dirs(root: Path) -> None:
+    """Drop a removed directory and everything below it from the created-directory cache"""
+    root = root.resolve()
+    with _created_dirs_lock:
+        _created_dirs.difference_update([path for path in _created_dirs if path == root or root in path.parents])
+
+
+def _find_tf_files(root: Path, stop_at_first: bool = False) -> Tuple[int, Optional[Path]]:
+    """Count .tf files under root in a single directory walk
+    
+    .terraform directories (provider plugins and downloaded modules, often thousands of
+    files) are not descended into, since they hold no exported code.
+    
+    Args:
+        root: Directory to search
+        stop_at_first: Return as soon as one .tf file is found (count is then 0 or 1)
+    
+    Returns:
+        Tuple of (number of .tf files, directory containing the first one found)
+    """
+    count = 0
+    first_dir = None
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name != '.terraform':
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.tf'):
+                        count += 1
+                        if first_dir is None:
+                            first_dir = Path(directory)
+                            if stop_at_first:
+                                return count, first_dir
+        except OSError:
+            continue
+    return count, first_dir
+
+
+# Terminal size reported on aztfexport's pty (a new pty is 0x0), wide enough to avoid wrapping
+PTY_ROWS = 50
+PTY_COLUMNS = 200
+
+
+def _open_pty() -> Tuple[int, int]:
+    """Open a pseudo-terminal for aztfexport, returning (master fd, slave fd)"""
+    master_fd, slave_fd = pty.openpty()
+    fcntl.ioctl(slave_fd, termios.TIOCSWINSZ, struct.pack('HHHH', PTY_ROWS, PTY_COLUMNS, 0, 0))
+    return master_fd, slave_fd
+
+
+def _kill_process(process: subprocess.Popen, process_group: bool) -> None:
+    """Kill an aztfexport process; with its own session (pty mode), everything it started too"""
+    try:
+        if process_group:
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+# Running aztfexport processes (-> whether each has its own process group). Exports started
+# from worker threads never see Ctrl-C, and pty mode puts them in their own session (out of
+# reach of the terminal's SIGINT), so an interrupted run kills them through this registry.
+_running_processes: Dict[subprocess.Popen, bool] = {}
+_running_processes_lock = threading.Lock()
+_stopping = threading.Event()
+
+
+def terminate_running_exports() -> None:
+    """Kill every running aztfexport process and refuse to start new ones
+    
+    Meant for the main thread's Ctrl-C / fatal error handling; exports waiting to run
+    fail instead of starting, so worker pools can shut down promptly.
+    """
+    _stopping.set()
+    with _running_processes_lock:
+        running = list(_running_processes.items())
+    for process, process_group in running:
+        _kill_process(process, process_group)
+
+
+def _cancel_pool(executor: ThreadPoolExecutor) -> None:
+    """Drop an interrupted pool's queued work and kill its running exports"""
+    executor.shutdown(wait=False, cancel_futures=True)
+    terminate_running_exports()
+
+
+class _PtyReader:
+    """Binary stream over a pty master, for _iter_output_batches
+    
+    Once every slave end is closed (the process exited), reads fail with EIO on Linux;
+    that is treated as end of output.
+    """
+    
+    def __init__(self, fd: int):
+        self.fd = fd
+    
+    def read1(self, size: int) -> bytes:
+        try:
+            return os.read(self.fd, size)
+        except OSError as e:
+            if e.errno == errno.EIO:
+                return b''
+            raise
+    
+    def close(self):
+        os.close(self.fd)
+
+
+@lru_cache(maxsize=1)
+def _find_az_cli() -> str:
+    """Find Azure CLI executable path (cross-platform, looked up once per process)"""
+    az_path = shutil.which('az')
+    if az_path:
+        return az_path
+    
+    system = platform.system()
+    if system == 'Windows':
+        common_paths = [
+            os.path.expanduser('~\\AppData\\Local\\Programs\\Azure CLI\\az.exe'),
+            'C:\\Program Files\\Microsoft SDKs\\Azure\\CLI2\\wbin\\az.exe',
+            'C:\\Program Files (x86)\\Microsoft SDKs\\Azure\\CLI2\\wbin\\az.exe',
+        ]
+    elif system == 'Darwin':
+        common_paths = [
+            '/opt/homebrew/bin/az',
+            '/usr/local/bin/az',
+            '/usr/bin/az',
+        ]
+    else:
+        common_paths = [
+            '/usr/bin/az',
+            '/usr/local/bin/az',
+            '/opt/az/bin/az',
+        ]
+    
+    for path in common_paths:
+        if os.path.exists(path):
+            return path
+    
+    return 'az'
+
+
+# Set once aztfexport has been found, so later checks skip running it again
+_aztfexport_available = False
+
+
+def _check_aztfexport_installed() -> bool:
+    """Check if aztfexport is installed (a positive result is remembered for the process)"""
+    global _aztfexport_available
+    if _aztfexport_available:
+        return True
+    try:
+        result = subprocess.run(
+            ['aztfexport', '--version'],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return False
+    _aztfexport_available = result.returncode == 0
+    return _aztfexport_available
+
+
+@lru_cache(maxsize=32)
+def _compile_exclude_patterns(exclude_patterns: Tuple[str, ...]) -> Optional[Callable[[str], Optional[str]]]:
+    """Build a case-insensitive matcher returning the exclude pattern a name matches
+    
+    Every pattern matches its exact name through a dict lookup; only patterns containing
+    wildcards (*, ?, [) go into a single regex, as named groups (p0, p1, ...) so the
+    matching pattern can be recovered via match.lastgroup. Returns None if there are no
+    patterns. Cached per pattern tuple, so each pattern is lowercased and translated only once.
+    """
+    if not exclude_patterns:
+        return None
+    exact: Dict[str, str] = {}
+    alternatives = []
+    for i, pattern in enumerate(exclude_patterns):
+        pattern_lower = pattern.lower()
+        exact.setdefault(pattern_lower, pattern)
+        if any(c in pattern_lower for c in '*?['):
+            alternatives.append(f"(?P<p{i}>{fnmatch.translate(pattern_lower)})")
+    wildcard_re = re.compile('|'.join(alternatives)) if alternatives else None
+    
+    def match(name: str) -> Optional[str]:
+        name_lower = name.lower()
+        pattern = exact.get(name_lower)
+        if pattern is None and wildcard_re is not None:
+            wildcard_match = wildcard_re.match(name_lower)
+            if wildcard_match:
+                pattern = exclude_patterns[int(wildcard_match.lastgroup[1:])]
+        return pattern
+    
+    return match
+
+
+def _iter_output_batches(stream, chunk_size: int = 65536) -> Iterator[List[str]]:
+    """Yield decoded lines from a binary process stream, one list per chunk read
+    
+    read1() returns whatever output is available (up to chunk_size), so progress is
+    still streamed promptly while bursts of output arrive as a single batch. Line
+    endings are normalized like text mode's universal newlines: CRLF and a bare CR
+    both end a line.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    pending = ''
+    while True:
+        chunk = stream.read1(chunk_size)
+        if not chunk:
+            break
+        pending += decoder.decode(chunk)
+        # Hold back a trailing \r in case its \n arrives with the next chunk
+        held_cr = pending.endswith('\r')
+        if held_cr:
+            pending = pending[:-1]
+        lines = pending.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        pending = lines.pop() + ('\r' if held_cr else '')
+        if lines:
+            yield lines
+    
+    pending = (pending + decoder.decode(b'', final=True)).replace('\r\n', '\n').replace('\r', '\n')
+    lines = pending.split('\n')
+    if not lines[-1]:
+        lines.pop()
+    if lines:
+        yield lines
 
 
 class ExportManager:
@@ -25,80 +372,90 @@ class ExportManager:
         
         # Set log level from config if specified
         log_level = self.config.get('logging', {}).get('level', os.getenv('LOG_LEVEL', 'INFO'))
-        from logger import set_log_level
         set_log_level(log_level)
         self.logger = get_logger()
         
         self.base_dir = os.getenv('OUTPUT_DIR') or self.config.get('output', {}).get('base_dir', './exports')
-        self.az_cli_path = self._find_az_cli()
-    
-    def _find_az_cli(self) -> str:
-        """Find Azure CLI executable path (cross-platform)"""
-        az_path = shutil.which('az')
-        if az_path:
-            return az_path
-        
-        system = platform.system()
-        if system == 'Windows':
-            common_paths = [
-                os.path.expanduser('~\\AppData\\Local\\Programs\\Azure CLI\\az.exe'),
-                'C:\\Program Files\\Microsoft SDKs\\Azure\\CLI2\\wbin\\az.exe',
-                'C:\\Program Files (x86)\\Microsoft SDKs\\Azure\\CLI2\\wbin\\az.exe',
-            ]
-        elif system == 'Darwin':
-            common_paths = [
-                '/opt/homebrew/bin/az',
-                '/usr/local/bin/az',
-                '/usr/bin/az',
-            ]
-        else:
-            common_paths = [
-                '/usr/bin/az',
-                '/usr/local/bin/az',
-                '/opt/az/bin/az',
-            ]
-        
-        for path in common_paths:
-            if os.path.exists(path):
-                return path
-        
-        return 'az'
-    
-    def _matches_exclude_pattern(self, rg_name: str, exclude_patterns: List[str]) -> bool:
-        """Check if resource group name matches any exclude pattern (supports wildcards, case-insensitive)"""
-        rg_name_lower = rg_name.lower()
-        for pattern in exclude_patterns:
-            pattern_lower = pattern.lower()
-            # Case-insensitive exact match
-            if rg_name_lower == pattern_lower:
-                return True
-            # Case-insensitive wildcard match using fnmatchcase with lowercased strings
-            if fnmatch.fnmatchcase(rg_name_lower, pattern_lower):
-                return True
-        return False
+        # Working directory for every aztfexport process, resolved once
+        self._base_dir_resolved = str(Path(self.base_dir).resolve())
+        self._prefetched_resource_groups: Dict[str, List[Dict[str, Any]]] = {}
+        # Filtered resource group names keyed by (subscription ID, exclude patterns)
+        self._rg_cache: Dict[Tuple[str, Tuple[str, ...]], List[str]] = {}
+        # Seconds an on-disk resource group listing stays valid (0 = always list from Azure)
+        self._rg_listing_cache_ttl = float(self.config.get('azure', {}).get('resource_group_cache_ttl', 0) or 0)
+        self._git_manager = None
+        
+        # Resource group exclude patterns (global + per-export), de-duplicated in first-seen
+        # order and compiled once into a matcher (see _compile_exclude_patterns), so filtering
+        # is a dict lookup plus at most one regex match per resource group
+        global_excludes = self.config.get('global_excludes', {}).get('resource_groups', [])
+        local_excludes = self.config.get('aztfexport', {}).get('exclude_resource_groups', [])
+        self._rg_exclude_patterns: Tuple[str, ...] = tuple(dict.fromkeys(chain(global_excludes, local_excludes)))
+        self._rg_exclude_match = _compile_exclude_patterns(self._rg_exclude_patterns)
+        
+        # GitManager configures credentials in the global git config, so pushes run one at a time
+        self._git_lock = threading.Lock()
         
+        # Optional cap on aztfexport processes running at once, across all subscription
+        # and resource group workers
+        max_processes = int(self.config.get('aztfexport', {}).get('max_concurrent_processes', 0) or 0)
+        self._process_slots = threading.BoundedSemaphore(max_processes) if max_processes > 0 else None
+        # Built once (after .env files are loaded by main.py) and shared by every export
+        self._aztfexport_env = _build_aztfexport_env(
+            bool(self.config.get('aztfexport', {}).get('minimal_env', False))
+        )
+        # Private copies of the Azure CLI config dir per subscription (aztfexport.isolate_azure_config);
+        # None records a failed copy, so later exports use the shared config without retrying
+        self._azure_config_dirs: Dict[str, Optional[str]] = {}
+        self._azure_config_lock = threading.Lock()
+        # Per resource group outcomes, rewritten as each export finishes so an interrupted
+        # run can be resumed (output.resume_from_checkpoint)
+        self._checkpoint_path = Path(self.base_dir) / '.checkpoint.json'
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint: Dict[str, Dict[str, str]] = {}
+        self._resume_checkpoint: Dict[str, Dict[str, str]] = {}
+        if self.config.get('output', {}).get('resume_from_checkpoint', False):
+            self._resume_checkpoint = self._load_checkpoint()
+            # Keep the old entries, so interrupting the resumed run doesn't lose them
+            self._checkpoint = {sub_id: dict(rgs) for sub_id, rgs in self._resume_checkpoint.items()}
+        # Subscription results appended as each one finishes, so long runs can be followed
+        # (and partially inspected) before export_results.json is written at the end
+        self._results_stream_path = Path(self.base_dir) / 'export_results.ndjson'
+        self._results_stream_lock = threading.Lock()
+        self._results_stream_started = False
+        self.max_parallel_subscriptions = max(
+            1, int(self.config.get('aztfexport', {}).get('max_parallel_subscriptions', 1))
+        )
+        # Settings consulted for every resource group export, read from config once
+        aztfexport_config = self.config.get('aztfexport', {})
+        self._use_pty = bool(aztfexport_config.get('use_pty', True))
+        self._isolate_azure_config = bool(aztfexport_config.get('isolate_azure_config', False))
+        self._throttle_retries = int(aztfexport_config.get('throttle_retries', 2))
+        self._throttle_retry_delay = float(aztfexport_config.get('throttle_retry_delay', 30))
+        self._exclude_resource_types = list(aztfexport_config.get('exclude_resource_types', []))
+        self._log_dir = self.config.get('output', {}).get('log_dir')
+    
+    @cached_property
+    def az_cli_path(self) -> str:
+        """Azure CLI executable, located on first use"""
+        return _find_az_cli()
+    
+    @cached_property
+    def azure_client(self) -> AzureClient:
+        """ARM REST client, created on first use"""
+        return AzureClient(
+            self.az_cli_path,
+            token_cache=self.config.get('azure', {}).get('token_cache', False)
+        )
+    
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """Load configuration from YAML file"""
-        with open(config_path, 'r') as f:
-            return yaml.safe_load(f)
-    
+        return load_config(config_path)
     
-    def _check_aztfexport_installed(self) -> bool:
-        """Check if aztfexport is installed"""
-        try:
-            result = subprocess.run(
-                ['aztfexport', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return False
     
     def _install_aztfexport(self):
         """Install aztfexport if not present"""
-        if self._check_aztfexport_installed():
+        if _check_aztfexport_installed():
             self.logger.success("aztfexport is already installed")
             return
         
@@ -116,25 +473,30 @@ class ExportManager:
             self.logger.info("  Option 2: Download from https://github.com/Azure/aztfexport/releases")
             raise
     
+    def get_exclude_subscriptions(self) -> Set[str]:
+        """Get subscription IDs/names to exclude, as a set for O(1) membership checks"""
+        exclude_subscriptions_raw = self.config.get('exclude_subscriptions', {})
+        # Flatten prod and non-prod lists into single set
+        if isinstance(exclude_subscriptions_raw, dict):
+            prod_list = exclude_subscriptions_raw.get('prod') or []
+            non_prod_list = exclude_subscriptions_raw.get('non-prod') or []
+            exclude_subscriptions = (prod_list if isinstance(prod_list, list) else []) + (non_prod_list if isinstance(non_prod_list, list) else [])
+        else:
+            # Backward compatibility: if it's a list, use it directly
+            exclude_subscriptions = exclude_subscriptions_raw if isinstance(exclude_subscriptions_raw, list) else []
+        return set(exclude_subscriptions)
+    
     def get_subscriptions_from_azure(self) -> List[Dict[str, Any]]:
         """Get all subscriptions accessible to the current Azure CLI account"""
         subscriptions = []
         
         try:
-            result = subprocess.run(
-                [self.az_cli_path, 'account', 'list', '--query', '[].{id:id, name:name, state:state}', '--output', 'json'],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=True
-            )
-            
-            subs_data = json.loads(result.stdout)
+            subs_data = self.azure_client.list_subscriptions()
             
             for sub in subs_data:
-                sub_id = sub.get('id', '').strip()
-                sub_name = sub.get('name', '').strip()
-                sub_state = sub.get('state', '').strip()
+                sub_id = (sub.get('subscriptionId') or '').strip()
+                sub_name = (sub.get('displayName') or '').strip()
+                sub_state = (sub.get('state') or '').strip()
                 
                 # Only include enabled subscriptions
                 if sub_id and sub_state.lower() == 'enabled':
@@ -149,80 +511,107 @@ class ExportManager:
             return subscriptions
             
         except subprocess.TimeoutExpired:
-            self.logger.error("Timeout listing subscriptions (exceeded 30 seconds)")
+            self.logger.error("Timeout acquiring Azure access token (exceeded 30 seconds)")
             return []
         except FileNotFoundError:
             self.logger.error("Azure CLI not found. Please install: https://docs.microsoft.com/cli/azure/install-azure-cli")
             return []
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"Azure CLI command failed: {e.stderr}")
+            self.logger.error(f"Azure CLI command failed: {e.stderr.decode(errors='replace') if e.stderr else e}")
             self.logger.info("Make sure you're logged in: az login")
             return []
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse Azure CLI output: {str(e)}")
+        except requests.RequestException as e:
+            self.logger.error(f"Azure Resource Manager request failed: {str(e)}")
+            return []
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            self.logger.error(f"Failed to parse Azure response: {str(e)}")
             return []
         except Exception as e:
             self.logger.error(f"Error listing subscriptions: {str(e)}")
             return []
     
+    def prefetch_resource_groups(self, subscriptions: List[Dict[str, Any]], max_workers: int = 8):
+        """Discover resource groups for all subscriptions up front, in parallel
+        
+        With azure.resource_graph_discovery enabled, a single Resource Graph query is tried
+        first, falling back to (batched) ARM listings if it fails. Results are consumed by
+        _get_resource_groups; subscriptions that could not be listed here are simply
+        queried again (serially) when they are exported.
+        """
+        subscription_ids = [sub['id'] for sub in subscriptions if sub.get('id')]
+        
+        cached_listings = {}
+        for subscription_id in subscription_ids:
+            rgs_data = self._read_rg_listing_cache(subscription_id)
+            if rgs_data is not None:
+                cached_listings[subscription_id] = rgs_data
+        if cached_listings:
+            self.logger.info(f"Using cached resource group listings for {len(cached_listings)} subscription(s)")
+            subscription_ids = [sub_id for sub_id in subscription_ids if sub_id not in cached_listings]
+        self._prefetched_resource_groups = dict(cached_listings)
+        if not subscription_ids:
+            return
+        
+        self.logger.info(f"Discovering resource groups for {len(subscription_ids)} subscription(s)...")
+        listings = None
+        if self.config.get('azure', {}).get('resource_graph_discovery', False):
+            try:
+                listings = self.azure_client.graph_list_resource_groups(subscription_ids)
+                self.logger.debug(f"Listed resource groups for {len(subscription_ids)} subscription(s) via Resource Graph")
+            except Exception as e:
+                self.logger.warning(f"Resource Graph query failed, listing resource groups per subscription: {str(e)}")
+        
+        if listings is None:
+            try:
+                listings = self.azure_client.get_resource_groups_bulk(subscription_ids, max_workers)
+            except Exception as e:
+                self.logger.warning(f"Could not prefetch resource groups: {str(e)}")
+                return
+            self.logger.debug(f"Prefetched resource groups for {len(listings)} subscription(s)")
+        
+        for subscription_id, rgs_data in listings.items():
+            self._write_rg_listing_cache(subscription_id, rgs_data)
+        self._prefetched_resource_groups.update(listings)
+    
     def _get_resource_groups(self, subscription_id: str, subscription_name: str = None) -> List[str]:
-        """Get list of resource groups in a subscription using Azure CLI"""
-        resource_groups = []
-        global_excludes = self.config.get('global_excludes', {}).get('resource_groups', [])
-        local_excludes = self.config.get('aztfexport', {}).get('exclude_resource_groups', [])
-        exclude_patterns = global_excludes + local_excludes
+        """Get list of resource groups in a subscription using the ARM REST API"""
+        exclude_patterns = self._rg_exclude_patterns
+        exclude_match = self._rg_exclude_match
         
         sub_display = f" ({subscription_name})" if subscription_name else ""
         
+        cache_key = (subscription_id, exclude_patterns)
+        cached = self._rg_cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug(f"Using cached resource group list{sub_display}")
+            return list(cached)
+        
         try:
-            result = subprocess.run(
-                [self.az_cli_path, 'group', 'list', '--subscription', subscription_id, '--output', 'json'],
-                capture_output=True,
-                text=True,
-                timeout=30,
-                check=True
-            )
-            
-            rgs_data = json.loads(result.stdout)
-            excluded_rgs = []  # List of (rg_name, matching_pattern) tuples
-            
-            for rg in rgs_data:
-                rg_name = rg.get('name', '').strip()
-                if rg_name:
-                    # Check which pattern matches (if any) - case-insensitive
-                    matching_pattern = None
-                    rg_name_lower = rg_name.lower()
-                    for pattern in exclude_patterns:
-                        pattern_lower = pattern.lower()
-                        # Case-insensitive exact match
-                        if rg_name_lower == pattern_lower:
-                            matching_pattern = pattern
-                            break
-                        # Case-insensitive wildcard match
-                        if fnmatch.fnmatchcase(rg_name_lower, pattern_lower):
-                            matching_pattern = pattern
-                            break
-                    
-                    if matching_pattern:
-                        excluded_rgs.append((rg_name, matching_pattern))
-                        continue
-                    
-                    if isinstance(rg_name, str) and rg_name:
-                        resource_groups.append(rg_name)
-                    else:
-                        self.logger.warning(f"Skipping invalid resource group name: {rg_name}")
+            rgs_data = self._prefetched_resource_groups.pop(subscription_id, None)
+            if rgs_data is None:
+                rgs_data = self._read_rg_listing_cache(subscription_id)
+            if rgs_data is None:
+                rgs_data = self.azure_client.list_resource_groups(subscription_id)
+                self._write_rg_listing_cache(subscription_id, rgs_data)
+            rg_names = [name for name in (rg.get('name', '').strip() for rg in rgs_data) if name]
+            if exclude_match:
+                # Pair each name with the pattern it matches (if any) - case-insensitive exact or wildcard match
+                matches = [(rg_name, exclude_match(rg_name)) for rg_name in rg_names]
+                excluded_rgs = [(rg_name, pattern) for rg_name, pattern in matches if pattern]
+                resource_groups = [rg_name for rg_name, pattern in matches if not pattern]
+            else:
+                excluded_rgs = []
+                resource_groups = rg_names
             
             # Log detailed exclusion information
             if excluded_rgs:
-                self.logger.info(f"Excluded resource groups{sub_display}:")
-                for rg_name, pattern in excluded_rgs:
-                    self.logger.info(f"  ✗ {rg_name} (matched pattern: {pattern})")
+                self.logger.info("Excluded resource groups%s:", sub_display)
+                self.logger.info_lines(f"  ✗ {rg_name} (matched pattern: {pattern})" for rg_name, pattern in excluded_rgs)
             
             # Log resource groups that will be processed
             if resource_groups:
-                self.logger.info(f"Resource groups to process{sub_display}:")
-                for rg_name in resource_groups:
-                    self.logger.info(f"  ✓ {rg_name}")
+                self.logger.info("Resource groups to process%s:", sub_display)
+                self.logger.info_lines(f"  ✓ {rg_name}" for rg_name in resource_groups)
             
             # Summary log
             total_rgs = len(resource_groups) + len(excluded_rgs)
@@ -231,25 +620,62 @@ class ExportManager:
             else:
                 self.logger.success(f"Found {len(resource_groups)} resource groups{sub_display} (none excluded)")
             
-            return resource_groups
+            self._rg_cache[cache_key] = resource_groups
+            return list(resource_groups)
             
         except subprocess.TimeoutExpired:
-            self.logger.error("Timeout listing resource groups (exceeded 30 seconds)")
+            self.logger.error("Timeout acquiring Azure access token (exceeded 30 seconds)")
             return []
         except FileNotFoundError:
             self.logger.error("Azure CLI not found. Please install: https://docs.microsoft.com/cli/azure/install-azure-cli")
             return []
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"Azure CLI command failed: {e.stderr}")
+            self.logger.error(f"Azure CLI command failed: {e.stderr.decode(errors='replace') if e.stderr else e}")
             self.logger.info("Make sure you're logged in: az login")
             return []
-        except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse Azure CLI output: {str(e)}")
+        except requests.RequestException as e:
+            self.logger.error(f"Azure Resource Manager request failed: {str(e)}")
+            return []
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            self.logger.error(f"Failed to parse Azure response: {str(e)}")
             return []
         except Exception as e:
             self.logger.error(f"Error listing resource groups: {str(e)}")
             return []
     
+    def _rg_listing_cache_path(self, subscription_id: str) -> Path:
+        """Path of a subscription's on-disk resource group listing"""
+        return RESOURCE_GROUP_CACHE_DIR / subscription_id / 'groups.json'
+    
+    def _read_rg_listing_cache(self, subscription_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return a subscription's cached resource group listing if it is younger than the TTL"""
+        if self._rg_listing_cache_ttl <= 0:
+            return None
+        cache_path = self._rg_listing_cache_path(subscription_id)
+        try:
+            if time.time() - cache_path.stat().st_mtime >= self._rg_listing_cache_ttl:
+                return None
+            rgs_data = json.loads(cache_path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.debug(f"Ignoring unreadable resource group cache {cache_path}: {str(e)}")
+            return None
+        return rgs_data if isinstance(rgs_data, list) else None
+    
+    def _write_rg_listing_cache(self, subscription_id: str, rgs_data: List[Dict[str, Any]]):
+        """Atomically store a subscription's resource group listing (names only)"""
+        if self._rg_listing_cache_ttl <= 0:
+            return
+        cache_path = self._rg_listing_cache_path(subscription_id)
+        tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps([{'name': rg.get('name', '')} for rg in rgs_data]))
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.debug(f"Could not write resource group cache: {str(e)}")
+    
     def _build_resource_graph_query(
         self,
         exclude_resource_types: List[str],
@@ -262,135 +688,267 @@ class ExportManager:
         if not exclude_resource_types:
             return ""
         
-        conditions = []
-        for resource_type in exclude_resource_types:
-            escaped_type = resource_type.replace("'", "''")
-            conditions.append(f"type != '{escaped_type}'")
+        # One case-insensitive predicate (Resource Graph reports types in lowercase)
+        types = ", ".join("'" + resource_type.replace("'", "''") + "'" for resource_type in exclude_resource_types)
+        return f"type !in~ ({types})"
+    
+    def _run_aztfexport(
+        self,
+        cmd: List[str],
+        output_prefix: str = '',
+        log_file: Optional[TextIO] = None,
+        env: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, List[str]]:
+        """Run an aztfexport command, streaming its de-duplicated output to stdout
+        
+        Args:
+            cmd: aztfexport command line
+            output_prefix: Prefix for each streamed line (identifies parallel exports)
+            log_file: Optional file receiving the complete, unfiltered output
+            env: Process environment (defaults to the shared aztfexport environment)
+            
+        Returns:
+            Tuple of (exit code, distinct output lines)
+        """
+        self.logger.debug(f"Running command: {shlex.join(cmd)}")
+        
+        # Run aztfexport on a pseudo-terminal (prevents aztfexport TTY errors) opened
+        # directly rather than through a `script` helper process; can be turned off where
+        # aztfexport runs fine headless
+        use_pty = self._use_pty and pty is not None
+        
+        with self._process_slots or nullcontext():
+            if _stopping.is_set():
+                raise RuntimeError("Export run is being stopped")
+            # Opened only once a process slot is free, so waiting exports don't hold a pty
+            master_fd, slave_fd = _open_pty() if use_pty else (None, None)
+            try:
+                process = subprocess.Popen(
+                    cmd,
+                    cwd=self._base_dir_resolved,
+                    stdin=subprocess.DEVNULL if slave_fd is None else slave_fd,
+                    stdout=subprocess.PIPE if slave_fd is None else slave_fd,
+                    stderr=subprocess.STDOUT,
+                    env=env or self._aztfexport_env,
+                    bufsize=-1,
+                    # Own process group, so everything aztfexport starts can be killed with it
+                    start_new_session=use_pty
+                )
+            except BaseException:
+                if master_fd is not None:
+                    os.close(master_fd)
+                raise
+            finally:
+                # The child holds its own copy; ours must be closed for EOF to be seen
+                if slave_fd is not None:
+                    os.close(slave_fd)
+            stream = process.stdout if master_fd is None else _PtyReader(master_fd)
+            with _running_processes_lock:
+                _running_processes[process] = use_pty
+                # terminate_running_exports() may have run while this one was starting
+                stopping = _stopping.is_set()
+            if stopping:
+                _kill_process(process, use_pty)
+            
+            output_lines = []
+            # Bounded LRU of recent lines, so long runs don't keep every progress line in memory
+            seen_lines = OrderedDict()
+            
+            try:
+                for batch in _iter_output_batches(stream):
+                    if log_file:
+                        log_file.write(''.join(line.rstrip() + '\n' for line in batch))
+                    new_lines = []
+                    for line in batch:
+                        line = line.rstrip()
+                        if line in seen_lines:
+                            seen_lines.move_to_end(line)
+                        else:
+                            seen_lines[line] = None
+                            if len(seen_lines) > OUTPUT_DEDUP_MAX_LINES:
+                                seen_lines.popitem(last=False)
+                            new_lines.append(line)
+                    if new_lines:
+                        output_lines.extend(new_lines)
+                        # One write and flush per chunk read rather than per line
+                        text = ''.join(output_prefix + line + '\n' for line in new_lines)
+                        with output_lock:
+                            sys.stdout.write(text)
+                            sys.stdout.flush()
+            except BaseException:
+                # e.g. Ctrl-C or a failed log write: don't leave the export running unattended
+                _kill_process(process, use_pty)
+                raise
+            finally:
+                stream.close()
+                try:
+                    exit_code = process.wait(timeout=3600)
+                except subprocess.TimeoutExpired:
+                    _kill_process(process, use_pty)
+                    raise
+                finally:
+                    with _running_processes_lock:
+                        _running_processes.pop(process, None)
+        
+        return exit_code, output_lines
+    
+    @cached_property
+    def _command_template(self) -> Tuple[str, Optional[str], List[str]]:
+        """aztfexport mode, base Resource Graph query and extra arguments, derived from config once
+        
+        Only the subscription, output directory and resource group differ between exports.
+        Query mode is used when resource types are excluded or a custom query is set.
+        """
+        aztfexport_config = self.config.get('aztfexport', {})
+        query = self._build_resource_graph_query(
+            self._exclude_resource_types,
+            aztfexport_config.get('query', None)
+        )
+        additional_flags = list(aztfexport_config.get('additional_flags', []))
+        if query:
+            return 'query', query, additional_flags
+        
+        extra_args = list(chain(
+            chain.from_iterable(('--resource-type', rt) for rt in aztfexport_config.get('resource_types', [])),
+            chain.from_iterable(('--exclude', er) for er in aztfexport_config.get('exclude_resources', [])),
+            additional_flags
+        ))
+        return 'resource-group', None, extra_args
+    
+    def _build_command(self, subscription_id: str, rg_name: str, output_path: Path) -> List[str]:
+        """Build the aztfexport command line for one resource group"""
+        mode, query, extra_args = self._command_template
+        cmd = [
+            'aztfexport',
+            mode,
+            '--subscription-id', subscription_id,
+            '--output-dir', str(output_path),
+            '--non-interactive',
+            '--plain-ui',
+            *extra_args
+        ]
+        if mode == 'query':
+            if rg_name:
+                escaped_rg = rg_name.replace("'", "''")
+                cmd.append(f"{query} and resourceGroup == '{escaped_rg}'")
+            else:
+                cmd.append(query)
+        else:
+            cmd.append(rg_name)
+        return cmd
+    
+    def _get_export_log_path(self, subscription_name: str, resource_group: str) -> Optional[Path]:
+        """Get the file that receives a resource group's full aztfexport output
         
-        return " and ".join(conditions)
+        Logs are kept outside the export directories (aztfexport needs an empty output
+        directory, and they shouldn't be pushed). Returns None if output.log_dir is unset.
+        """
+        if not self._log_dir:
+            return None
+        sub_log_dir = _ensure_dir(Path(self.base_dir) / self._log_dir / self._sanitize_name(subscription_name))
+        return sub_log_dir / f"{self._sanitize_name(resource_group)}.log"
+    
+    def _get_aztfexport_env(self, subscription_id: str) -> Dict[str, str]:
+        """Get the environment for exporting from a subscription
+        
+        With aztfexport.isolate_azure_config enabled, each subscription gets its own copy of
+        the Azure CLI config directory, so concurrent aztfexport processes don't contend
+        for the token cache file lock in the shared one.
+        """
+        if not self._isolate_azure_config:
+            return self._aztfexport_env
+        
+        with self._azure_config_lock:
+            if subscription_id in self._azure_config_dirs:
+                config_dir = self._azure_config_dirs[subscription_id]
+            else:
+                source_dir = os.getenv('AZURE_CONFIG_DIR') or os.path.join(os.path.expanduser('~'), '.azure')
+                config_dir = None
+                try:
+                    config_dir = tempfile.mkdtemp(prefix=f"azure-{subscription_id}-")
+                    with os.scandir(source_dir) as entries:
+                        for entry in entries:
+                            if entry.is_file():
+                                shutil.copy2(entry.path, config_dir)
+                except OSError as e:
+                    self.logger.warning(f"Could not create isolated Azure CLI config for {subscription_id}: {str(e)}")
+                    if config_dir:
+                        shutil.rmtree(config_dir, True)
+                    config_dir = None
+                else:
+                    # Tokens are copied, so remove them when the process exits
+                    atexit.register(shutil.rmtree, config_dir, True)
+                self._azure_config_dirs[subscription_id] = config_dir
+        
+        if config_dir is None:
+            return self._aztfexport_env
+        return {**self._aztfexport_env, 'AZURE_CONFIG_DIR': config_dir}
     
     def _export_resource_group(
         self,
         subscription_id: str,
         subscription_name: str,
         resource_group: str,
-        output_path: Path
+        output_path: Path,
+        output_prefix: str = '',
+        clean_on_retry: bool = False
     ) -> bool:
-        """Export a single resource group using aztfexport"""
+        """Export a single resource group using aztfexport
+        
+        output_prefix is prepended to each streamed aztfexport output line, so that
+        output from concurrent exports can be told apart.
+        
+        Exports that fail because Azure throttled them (HTTP 429) are retried with
+        exponential backoff. clean_on_retry removes partial output before a retry and
+        must only be set when output_path belongs to this resource group alone.
+        
+        output_path must be absolute, with an existing parent directory (export_subscription
+        resolves and creates the subscription directory once for all its resource groups).
+        """
         self.logger.info(f"Exporting resource group: {resource_group}")
         
-        output_path = output_path.resolve()
-        output_path.parent.mkdir(parents=True, exist_ok=True)
         rg_name = str(resource_group).strip()
         
-        exclude_resource_types = self.config.get('aztfexport', {}).get('exclude_resource_types', [])
-        custom_query = self.config.get('aztfexport', {}).get('query', None)
-        use_query_mode = bool(exclude_resource_types) or bool(custom_query)
-        
-        if use_query_mode:
-            query = self._build_resource_graph_query(exclude_resource_types, custom_query)
-            if query:
-                self.logger.info("Using query mode to exclude resource types")
-                if exclude_resource_types:
-                    self.logger.debug(f"Excluding types: {', '.join(exclude_resource_types)}")
-                self.logger.debug(f"Query: {query}")
-                
-                cmd = [
-                    'aztfexport',
-                    'query',
-                    '--subscription-id', subscription_id,
-                    '--output-dir', str(output_path),
-                    '--non-interactive',
-                    '--plain-ui'
-                ]
-                
-                if rg_name:
-                    query_with_rg = f"{query} and resourceGroup == '{rg_name}'" if query else f"resourceGroup == '{rg_name}'"
-                else:
-                    query_with_rg = query
-                
-                additional_flags = self.config.get('aztfexport', {}).get('additional_flags', [])
-                cmd.extend(additional_flags)
-                cmd.append(query_with_rg)
-            else:
-                use_query_mode = False
-        
-        if not use_query_mode:
-            cmd = [
-                'aztfexport',
-                'resource-group',
-                '--subscription-id', subscription_id,
-                '--output-dir', str(output_path),
-                '--non-interactive',
-                '--plain-ui'
-            ]
-            
-            resource_types = self.config.get('aztfexport', {}).get('resource_types', [])
-            if resource_types:
-                for rt in resource_types:
-                    cmd.extend(['--resource-type', rt])
-            
-            exclude_resources = self.config.get('aztfexport', {}).get('exclude_resources', [])
-            if exclude_resources:
-                for er in exclude_resources:
-                    cmd.extend(['--exclude', er])
-            
-            additional_flags = self.config.get('aztfexport', {}).get('additional_flags', [])
-            cmd.extend(additional_flags)
-            cmd.append(rg_name)
+        mode, query, _ = self._command_template
+        if mode == 'query':
+            self.logger.info("Using query mode to exclude resource types")
+            if self._exclude_resource_types:
+                self.logger.debug(f"Excluding types: {', '.join(self._exclude_resource_types)}")
+            self.logger.debug(f"Query: {query}")
+        cmd = self._build_command(subscription_id, rg_name, output_path)
         
         try:
-            cmd_display = ' '.join(f'"{arg}"' if ' ' in arg else arg for arg in cmd)
-            self.logger.debug(f"Running command: {cmd_display}")
             self.logger.debug(f"Resource group: {rg_name}")
             self.logger.debug(f"Output directory: {output_path}")
             self.logger.info("This may take several minutes...")
             
-            env = os.environ.copy()
-            env['AZTFEXPORT_NON_INTERACTIVE'] = 'true'
-            env['TERM'] = 'dumb'  # Set terminal type to dumb
-            env['NO_COLOR'] = '1'  # Disable color output
+            throttle_retries = self._throttle_retries
+            retry_delay = self._throttle_retry_delay
             
-            # Use script to emulate TTY (prevents aztfexport TTY errors)
-            import shutil
-            script_cmd = shutil.which('script')
+            log_path = self._get_export_log_path(subscription_name, rg_name)
+            if log_path:
+                self.logger.debug(f"Output log: {log_path}")
             
-            if script_cmd:
-                cmd_str = ' '.join(f'"{arg}"' if ' ' in arg or '"' in arg else arg for arg in cmd)
-                script_wrapper = [script_cmd, '-q', '-e', '-c', cmd_str]
-                final_cmd = script_wrapper
-            else:
-                final_cmd = cmd
+            env = self._get_aztfexport_env(subscription_id)
             
             self.logger.info(f"Starting export for {resource_group}...")
-            process = subprocess.Popen(
-                final_cmd,
-                cwd=str(Path(self.base_dir).resolve()),
-                stdin=subprocess.DEVNULL,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                env=env,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
-            
-            output_lines = []
-            seen_lines = set()
-            
-            try:
-                import sys
-                for line in iter(process.stdout.readline, ''):
-                    if line:
-                        line = line.rstrip()
-                        if line not in seen_lines:
-                            seen_lines.add(line)
-                            output_lines.append(line)
-                            sys.stdout.write(line + '\n')
-                            sys.stdout.flush()
-            finally:
-                process.stdout.close()
-                exit_code = process.wait(timeout=3600)
+            with open(log_path, 'w', encoding='utf-8') if log_path else nullcontext() as log_file:
+                for attempt in range(throttle_retries + 1):
+                    exit_code, output_lines = self._run_aztfexport(cmd, output_prefix, log_file, env)
+                    if exit_code == 0 or attempt == throttle_retries:
+                        break
+                    if not any(_THROTTLE_RE.search(line) for line in output_lines[-50:]):
+                        break
+                    delay = retry_delay * (2 ** attempt)
+                    self.logger.warning(
+                        f"Export of {resource_group} was throttled by Azure, retrying in {delay:.0f}s "
+                        f"(attempt {attempt + 2}/{throttle_retries + 1})"
+                    )
+                    # Returns early if the run is being stopped (the next attempt then fails fast)
+                    _stopping.wait(delay)
+                    if clean_on_retry and output_path.exists():
+                        # aztfexport requires an empty output directory
+                        shutil.rmtree(output_path)
             
             full_output = '\n'.join(output_lines)
             self.logger.info("")
@@ -404,20 +962,19 @@ class ExportManager:
                 self.logger.info("=" * 60)
             
             if exit_code == 0:
-                tf_files_direct = list(output_path.glob('*.tf'))
-                tf_files_recursive = list(output_path.rglob('*.tf'))
-                tf_files = tf_files_recursive if tf_files_recursive else tf_files_direct
+                tf_count, actual_dir = _find_tf_files(output_path)
                 
-                if tf_files:
-                    actual_dir = tf_files[0].parent
+                if tf_count:
                     self.logger.success(f"✓✓ Successfully exported {resource_group}")
-                    self.logger.info(f"   Created {len(tf_files)} Terraform file(s)")
+                    self.logger.info(f"   Created {tf_count} Terraform file(s)")
                     if actual_dir != output_path:
                         self.logger.debug(f"   Files created in: {actual_dir}")
                     return True
                 else:
                     if output_path.exists():
-                        all_files = list(output_path.iterdir())
+                        # scandir entries carry the file type, so no per-item stat is needed
+                        with os.scandir(output_path) as entries:
+                            all_files = list(entries)
                         self.logger.warning(f"⚠ Export completed but no .tf files found for {resource_group}")
                         self.logger.debug(f"   Checking directory: {output_path}")
                         if all_files:
@@ -442,15 +999,12 @@ class ExportManager:
                     for line in error_lines[-20:]:
                         if line.strip():
                             self.logger.error(f"     {line}")
+                if log_path:
+                    self.logger.info(f"   Full output: {log_path}")
                 self.logger.info("   Check the output above for error details")
                 return False
                 
         except subprocess.TimeoutExpired:
-            if 'process' in locals():
-                try:
-                    process.kill()
-                except:
-                    pass
             self.logger.error(f"✗✗ Timeout exporting {resource_group} (exceeded 1 hour)")
             return False
         except FileNotFoundError:
@@ -461,12 +1015,93 @@ class ExportManager:
             self.logger.error(f"Error exporting {resource_group}: {str(e)}")
             return False
     
+    def _load_checkpoint(self) -> Dict[str, Dict[str, str]]:
+        """Load resource group outcomes recorded by a previous run"""
+        try:
+            checkpoint = json.loads(self._checkpoint_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint {self._checkpoint_path}: {str(e)}")
+            return {}
+        self.logger.info(f"Resuming from checkpoint: {self._checkpoint_path}")
+        return checkpoint if isinstance(checkpoint, dict) else {}
+    
+    def _record_checkpoint(self, subscription_id: str, resource_group: str, status: str):
+        """Record a resource group's outcome and atomically rewrite the checkpoint file"""
+        with self._checkpoint_lock:
+            self._checkpoint.setdefault(subscription_id, {})[resource_group] = status
+            tmp_path = self._checkpoint_path.with_suffix('.tmp')
+            try:
+                tmp_path.write_text(json.dumps(self._checkpoint))
+                os.replace(tmp_path, self._checkpoint_path)
+            except OSError as e:
+                self.logger.debug(f"Could not write checkpoint: {str(e)}")
+    
+    def discard_checkpoint(self):
+        """Remove the checkpoint file, e.g. after a run without failures"""
+        with self._checkpoint_lock:
+            try:
+                self._checkpoint_path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.logger.debug(f"Could not remove checkpoint: {str(e)}")
+    
+    def _was_exported_before(self, subscription_id: str, resource_group: str, output_path: Path) -> bool:
+        """Check whether a resumed run can reuse a previous successful export
+        
+        Requires the checkpoint to say so and the exported files to still be on disk
+        (they are gone if the subscription was already pushed and cleaned up).
+        """
+        if self._resume_checkpoint.get(subscription_id, {}).get(resource_group) != 'success':
+            return False
+        tf_count, _ = _find_tf_files(output_path, stop_at_first=True)
+        return tf_count > 0
+    
+    def record_subscription_result(self, result: Dict[str, Any]):
+        """Append one subscription's result to export_results.ndjson (truncated on the first call)"""
+        line = json.dumps(result, default=str) + '\n'
+        with self._results_stream_lock:
+            mode = 'a' if self._results_stream_started else 'w'
+            try:
+                with open(self._results_stream_path, mode, encoding='utf-8') as f:
+                    f.write(line)
+                self._results_stream_started = True
+            except OSError as e:
+                self.logger.debug(f"Could not write {self._results_stream_path}: {str(e)}")
+    
+    def _find_empty_resource_groups(self, subscription_id: str, resource_groups: List[str]) -> Set[str]:
+        """Find resource groups without resources, so their (slow) aztfexport run can be skipped
+        
+        A resource group whose check fails is treated as non-empty and exported as usual.
+        """
+        def is_empty(rg: str) -> bool:
+            try:
+                return not self.azure_client.resource_group_has_resources(subscription_id, rg)
+            except Exception as e:
+                self.logger.debug(f"Could not check resources in {rg}: {str(e)}")
+                return False
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(resource_groups)))) as executor:
+            empty_rgs = {rg for rg, empty in zip(resource_groups, executor.map(is_empty, resource_groups)) if empty}
+        
+        if empty_rgs:
+            self.logger.info(f"Skipping {len(empty_rgs)} empty resource group(s):")
+            self.logger.info_lines(f"  - {rg}" for rg in resource_groups if rg in empty_rgs)
+        return empty_rgs
+    
     def export_subscription(
         self,
         subscription: Dict[str, Any],
-        create_rg_folders: bool = True
+        create_rg_folders: bool = True,
+        output_prefix: str = ''
     ) -> Dict[str, Any]:
-        """Export all resource groups in a subscription"""
+        """Export all resource groups in a subscription
+        
+        output_prefix is prepended to streamed aztfexport output (used when several
+        subscriptions are exported concurrently).
+        """
         subscription_id = subscription['id']
         subscription_name = subscription['name']
         
@@ -475,8 +1110,8 @@ class ExportManager:
         self.logger.info(f"Subscription ID: {subscription_id}")
         self.logger.info("=" * 60)
         
-        sub_dir = Path(self.base_dir) / self._sanitize_name(subscription_name)
-        sub_dir.mkdir(parents=True, exist_ok=True)
+        # Resolved once; every resource group path below is derived from it
+        sub_dir = _ensure_dir(Path(self.base_dir) / self._sanitize_name(subscription_name))
         
         self.logger.info("Discovering resource groups...")
         resource_groups = self._get_resource_groups(subscription_id, subscription_name)
@@ -487,35 +1122,84 @@ class ExportManager:
             'resource_groups': {},
             'total_rgs': len(resource_groups),
             'successful_rgs': 0,
-            'failed_rgs': 0
+            'failed_rgs': 0,
+            'skipped_rgs': 0
         }
         
         if not resource_groups:
             self.logger.info("No resource groups to export")
             return results
         
-        for rg in resource_groups:
-            if create_rg_folders:
-                rg_dir = sub_dir / self._sanitize_name(rg)
-            else:
-                rg_dir = sub_dir
-            
+        rg_dirs = {
+            rg: sub_dir / self._sanitize_name(rg) if create_rg_folders else sub_dir
+            for rg in resource_groups
+        }
+        
+        empty_rgs = set()
+        if self.config.get('aztfexport', {}).get('skip_empty_resource_groups', False):
+            empty_rgs = self._find_empty_resource_groups(subscription_id, resource_groups)
+        rgs_to_export = [rg for rg in resource_groups if rg not in empty_rgs]
+        
+        max_parallel = max(1, int(self.config.get('aztfexport', {}).get('max_parallel_exports', 1)))
+        if not create_rg_folders:
+            # All resource groups share one output directory, so they must run one at a time
+            max_parallel = 1
+        
+        outcomes = {}
+        if self._resume_checkpoint and create_rg_folders:
+            for rg in rgs_to_export:
+                if self._was_exported_before(subscription_id, rg, rg_dirs[rg]):
+                    self.logger.info(f"Skipping {rg} (already exported by the interrupted run)")
+                    outcomes[rg] = True
+                    self._record_checkpoint(subscription_id, rg, 'success')
+            rgs_to_export = [rg for rg in rgs_to_export if rg not in outcomes]
+        
+        def export_one(rg: str, prefix: str) -> bool:
             success = self._export_resource_group(
-                subscription_id,
-                subscription_name,
-                rg,
-                rg_dir
+                subscription_id, subscription_name, rg, rg_dirs[rg], prefix, create_rg_folders
             )
-            
-            if success:
+            self._record_checkpoint(subscription_id, rg, 'success' if success else 'failed')
+            return success
+        
+        if max_parallel > 1 and len(rgs_to_export) > 1:
+            self.logger.info(f"Exporting up to {max_parallel} resource groups in parallel")
+            with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+                futures = {
+                    executor.submit(export_one, rg, f"{output_prefix}[{rg}] "): rg
+                    for rg in rgs_to_export
+                }
+                try:
+                    for future in as_completed(futures):
+                        outcomes[futures[future]] = future.result()
+                except BaseException:
+                    _cancel_pool(executor)
+                    raise
+        else:
+            for rg in rgs_to_export:
+                outcomes[rg] = export_one(rg, output_prefix)
+        
+        # Record paths under the configured base_dir (not the resolved sub_dir) so
+        # export_results.json keeps the relative paths callers expect
+        report_sub_dir = Path(self.base_dir) / self._sanitize_name(subscription_name)
+        report_paths = {rg: str(report_sub_dir / rg_dirs[rg].relative_to(sub_dir)) for rg in resource_groups}
+        
+        # Record results in discovery order regardless of completion order
+        for rg in resource_groups:
+            if rg in empty_rgs:
+                results['resource_groups'][rg] = {
+                    'path': report_paths[rg],
+                    'status': 'skipped'
+                }
+                results['skipped_rgs'] += 1
+            elif outcomes[rg]:
                 results['resource_groups'][rg] = {
-                    'path': str(rg_dir),
+                    'path': report_paths[rg],
                     'status': 'success'
                 }
                 results['successful_rgs'] += 1
             else:
                 results['resource_groups'][rg] = {
-                    'path': str(rg_dir),
+                    'path': report_paths[rg],
                     'status': 'failed'
                 }
                 results['failed_rgs'] += 1
@@ -523,6 +1207,8 @@ class ExportManager:
         self.logger.success(f"Export completed for {subscription_name}")
         self.logger.info(f"Successful: {results['successful_rgs']}/{results['total_rgs']}")
         self.logger.info(f"Failed: {results['failed_rgs']}/{results['total_rgs']}")
+        if results['skipped_rgs']:
+            self.logger.info(f"Skipped (empty): {results['skipped_rgs']}/{results['total_rgs']}")
         
         return results
     
@@ -538,25 +1224,18 @@ class ExportManager:
             self.logger.error(f"Error with aztfexport: {str(e)}")
             return {}
         
-        Path(self.base_dir).mkdir(parents=True, exist_ok=True)
+        _ensure_dir(Path(self.base_dir))
         
         subscriptions = self.get_subscriptions_from_azure()
         if not subscriptions:
             self.logger.error("No subscriptions found. Check Azure CLI authentication and permissions.")
             return {}
         
-        exclude_subscriptions_raw = self.config.get('exclude_subscriptions', {})
-        # Flatten prod and non-prod lists into single list
-        if isinstance(exclude_subscriptions_raw, dict):
-            prod_list = exclude_subscriptions_raw.get('prod') or []
-            non_prod_list = exclude_subscriptions_raw.get('non-prod') or []
-            exclude_subscriptions = (prod_list if isinstance(prod_list, list) else []) + (non_prod_list if isinstance(non_prod_list, list) else [])
-        else:
-            # Backward compatibility: if it's a list, use it directly
-            exclude_subscriptions = exclude_subscriptions_raw if isinstance(exclude_subscriptions_raw, list) else []
+        exclude_subscriptions = self.get_exclude_subscriptions()
         create_rg_folders = self.config.get('output', {}).get('create_rg_folders', True)
         all_results = {}
         
+        subscriptions_to_process = []
         for sub in subscriptions:
             subscription_id = sub.get('id')
             subscription_name = sub.get('name', subscription_id)
@@ -566,36 +1245,63 @@ class ExportManager:
             if is_excluded:
                 self.logger.info(f"Skipping subscription {subscription_name} ({subscription_id}) (in exclude_subscriptions list)")
                 continue
-            
+            subscriptions_to_process.append(sub)
+        
+        self.prefetch_resource_groups(subscriptions_to_process)
+        
+        parallel = self.max_parallel_subscriptions > 1 and len(subscriptions_to_process) > 1
+        
+        def export_one(sub: Dict[str, Any]) -> Dict[str, Any]:
+            subscription_id = sub.get('id')
+            prefix = f"[{sub.get('name', subscription_id)}] " if parallel else ''
             try:
-                result = self.export_subscription(sub, create_rg_folders)
-                all_results[subscription_id] = result
+                result = self.export_subscription(sub, create_rg_folders, prefix)
             except Exception as e:
                 self.logger.error(f"Error exporting subscription {subscription_id}: {str(e)}")
-                all_results[subscription_id] = {
+                result = {
                     'subscription_id': subscription_id,
                     'subscription_name': sub.get('name', subscription_id),
                     'error': str(e)
                 }
+            self.record_subscription_result(result)
+            return result
+        
+        if parallel:
+            # Every aztfexport/ARM call takes an explicit subscription ID, so concurrent
+            # subscriptions never depend on the CLI's current account (no az account set race)
+            self.logger.info(f"Exporting up to {self.max_parallel_subscriptions} subscriptions in parallel")
+            with ThreadPoolExecutor(max_workers=self.max_parallel_subscriptions) as executor:
+                try:
+                    outcomes = list(executor.map(export_one, subscriptions_to_process))
+                except BaseException:
+                    _cancel_pool(executor)
+                    raise
+        else:
+            outcomes = [export_one(sub) for sub in subscriptions_to_process]
+        
+        for sub, result in zip(subscriptions_to_process, outcomes):
+            all_results[sub.get('id')] = result
+        
+        if not any(result.get('error') or result.get('failed_rgs') for result in all_results.values()):
+            self.discard_checkpoint()
         
         return all_results
     
     def _sanitize_name(self, name: str) -> str:
         """Sanitize name for filesystem"""
-        import re
-        name = re.sub(r'[^a-zA-Z0-9_-]', '_', name)
-        return name.lower()
+        return _sanitize_name(name)
     
     def push_subscription_to_git(
         self,
         subscription: Dict[str, Any],
         export_path: Path
     ) -> bool:
-        """Push exported subscription to git repository"""
-        from git_manager import GitManager
-        
-        git_manager = GitManager(self.config)
-        return git_manager.push_to_repo(subscription, export_path)
+        """Push exported subscription to git repository (one push at a time)"""
+        with self._git_lock:
+            if self._git_manager is None:
+                from git_manager import GitManager
+                self._git_manager = GitManager(self.config)
+            return self._git_manager.push_to_repo(subscription, export_path)
     
     def cleanup_export_directory(self, subscription: Dict[str, Any]) -> bool:
         """Clean up export directory after successful git push"""
@@ -606,8 +1312,8 @@ class ExportManager:
         try:
             sub_dir = Path(self.base_dir) / self._sanitize_name(subscription_name)
             if sub_dir.exists():
-                import shutil
                 shutil.rmtree(sub_dir)
+                _forget_dirs(sub_dir)
                 self.logger.info(f"Cleaned up export directory: {sub_dir}")
                 return True
         except Exception as e:
@@ -617,7 +1323,6 @@ class ExportManager:
     def check_disk_space(self, min_free_percent: float = 5.0) -> bool:
         """Check if there's enough free disk space"""
         try:
-            import shutil
             stat = shutil.disk_usage(self.base_dir)
             free_percent = (stat.free / stat.total) * 100
             
@@ -3,10 +3,13 @@ Git Manager for pushing exported Terraform code to Azure DevOps repositories
 """
 
 import os
+import re
 import subprocess
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 from urllib.parse import quote, urlparse
+import requests
 from logger import get_logger
 
 
@@ -19,6 +22,11 @@ class GitManager:
         self.config = config
         self.azure_devops_config = config.get('azure_devops', {})
         self.git_config = config.get('git', {})
+        # Resolved once per run rather than on every push step
+        self._pat_token = os.getenv('AZURE_DEVOPS_PAT') or os.getenv('SYSTEM_ACCESS_TOKEN')
+        self._branch = os.getenv('GIT_BRANCH') or self.git_config.get('branch', 'main')
+        self._existing_repos: Optional[Set[str]] = None
+        self._existing_repos_loaded = False
         
     def _get_repo_url(self, subscription: Dict[str, Any]) -> Optional[str]:
         """Get repository URL for a subscription using subscription name"""
@@ -39,25 +47,56 @@ class GitManager:
         
         return None
     
-    def _sanitize_name(self, name: str) -> str:
-        """Sanitize name for filesystem/repository"""
-        import re
-        name = re.sub(r'[^a-zA-Z0-9_-]', '_', name)
-        return name.lower()
+    def _get_existing_repos(self) -> Optional[Set[str]]:
+        """Get lowercased names of repositories in the Azure DevOps project (listed once per run)
+        
+        Returns None if the list could not be retrieved, in which case callers should
+        simply attempt the push as usual.
+        """
+        if self._existing_repos_loaded:
+            return self._existing_repos
+        self._existing_repos_loaded = True
+        
+        org = self.azure_devops_config.get('organization')
+        project = self.azure_devops_config.get('project')
+        pat_token = self._get_pat_token()
+        if not org or not project or not pat_token:
+            return None
+        
+        url = f"https://dev.azure.com/{quote(org, safe='')}/{quote(project, safe='')}/_apis/git/repositories"
+        try:
+            response = requests.get(url, params={'api-version': '7.0'}, auth=('', pat_token), timeout=30)
+            response.raise_for_status()
+            self._existing_repos = {repo['name'].lower() for repo in response.json().get('value', [])}
+            self.logger.debug(f"Found {len(self._existing_repos)} repositories in Azure DevOps project {project}")
+        except (requests.RequestException, ValueError, KeyError) as e:
+            self.logger.debug(f"Could not list Azure DevOps repositories: {str(e)}")
+        
+        return self._existing_repos
     
+    def _log_missing_repo(self, repo_url: str):
+        """Log instructions for creating a repository that does not exist"""
+        self.logger.error("")
+        self.logger.error("Repository does not exist in Azure DevOps.")
+        self.logger.error("Please create the repository first:")
+        self.logger.error(f"  Organization: {self.azure_devops_config.get('organization', 'N/A')}")
+        self.logger.error(f"  Project: {self.azure_devops_config.get('project', 'N/A')}")
+        self.logger.error(f"  Repository: {repo_url.split('/_git/')[-1] if '/_git/' in repo_url else 'N/A'}")
+        self.logger.error("")
+        self.logger.error("You can create it via:")
+        self.logger.error("  - Azure DevOps Portal: Repos > New Repository")
+        self.logger.error("  - Azure CLI: az repos create --name <repo-name> --project <project>")
     
     def _get_pat_token(self) -> Optional[str]:
         """Get Azure DevOps PAT token from environment"""
-        return os.getenv('AZURE_DEVOPS_PAT') or os.getenv('SYSTEM_ACCESS_TOKEN')
+        return self._pat_token
     
     def _get_branch(self, subscription: Dict[str, Any]) -> str:
         """Get main branch name (always main for latest export)"""
-        base_branch = os.getenv('GIT_BRANCH') or self.git_config.get('branch', 'main')
-        return base_branch  # Always use main for latest
+        return self._branch  # Always use main for latest
     
     def _get_backup_branch_name(self) -> str:
         """Get backup branch name with current date"""
-        from datetime import datetime
         date_str = datetime.now().strftime('%Y-%m-%d')
         return f"backup-{date_str}"
     
@@ -299,9 +338,6 @@ resource-group-name/
     def _cleanup_old_backup_branches(self, repo_path: Path, repo_url: str, retention_count: int = 10) -> bool:
         """Clean up backup branches, keeping only the most recent N (retention_count)"""
         try:
-            from datetime import datetime
-            import re
-            
             # Get all remote backup branches
             pat_token = self._get_pat_token()
             if not pat_token:
@@ -467,16 +503,7 @@ resource-group-name/
                 
                 # Check if repository doesn't exist
                 if 'not found' in error_msg.lower() or 'does not exist' in error_msg.lower():
-                    self.logger.error("")
-                    self.logger.error("Repository does not exist in Azure DevOps.")
-                    self.logger.error("Please create the repository first:")
-                    self.logger.error(f"  Organization: {self.azure_devops_config.get('organization', 'N/A')}")
-                    self.logger.error(f"  Project: {self.azure_devops_config.get('project', 'N/A')}")
-                    self.logger.error(f"  Repository: {repo_url.split('/_git/')[-1] if '/_git/' in repo_url else 'N/A'}")
-                    self.logger.error("")
-                    self.logger.error("You can create it via:")
-                    self.logger.error("  - Azure DevOps Portal: Repos > New Repository")
-                    self.logger.error("  - Azure CLI: az repos create --name <repo-name> --project <project>")
+                    self._log_missing_repo(repo_url)
                 
                 return False
         except subprocess.CalledProcessError as e:
@@ -506,6 +533,13 @@ resource-group-name/
         self.logger.info(f"Main branch: {main_branch} (latest export)")
         self.logger.info(f"Backup branch: {backup_branch} (keeping last {retention_count} runs)")
         
+        # Skip the init/commit/push round trip for repositories known not to exist
+        existing_repos = self._get_existing_repos()
+        if existing_repos is not None and subscription.get('name', '').lower() not in existing_repos:
+            self.logger.error(f"Repository not found for subscription {subscription.get('name')}")
+            self._log_missing_repo(repo_url)
+            return False
+        
         if not self._configure_git_credentials(repo_url):
             return False
         
@@ -10,10 +10,36 @@ import hashlib
 import base64
 from datetime import datetime
 from typing import Dict, Any, Optional, List
-from requests import post, RequestException
+import requests
+from requests import RequestException
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from logger import get_logger
 
 
+_session: Optional[requests.Session] = None
+
+
+def _get_session() -> requests.Session:
+    """Get or create the shared HTTP session so one TLS connection is reused across sends"""
+    global _session
+    if _session is None:
+        # The Data Collector POST is not idempotent: only retry when the request never reached the
+        # service (connect errors) or was explicitly rejected with 429/503, never after a read error
+        retry = Retry(
+            total=5,
+            connect=5,
+            read=0,
+            backoff_factor=0.5,
+            status_forcelist=[429, 503],
+            allowed_methods=frozenset(['POST']),
+            respect_retry_after_header=True
+        )
+        _session = requests.Session()
+        _session.mount('https://', HTTPAdapter(pool_maxsize=20, max_retries=retry))
+    return _session
+
+
 class LogAnalyticsSender:
     """Send data to Azure Log Analytics workspace using Data Collector API"""
     
@@ -84,7 +110,7 @@ class LogAnalyticsSender:
             }
             
             # Send request
-            response = post(self.uri, data=json_body, headers=headers, timeout=30)
+            response = _get_session().post(self.uri, data=json_body, headers=headers, timeout=30)
             response.raise_for_status()
             
             self.logger.success(f"Successfully sent {len(data)} record(s) to Log Analytics workspace")
@@ -96,7 +122,8 @@ class LogAnalyticsSender:
                 try:
                     error_detail = e.response.text
                     self.logger.debug(f"Error response: {error_detail}")
-                except:
+                except (RequestException, ValueError, LookupError):
+                    # Body unavailable or undecodable; the error itself was already logged
                     pass
             return False
         except Exception as e:
@@ -4,8 +4,14 @@ Logging utility with clear prefixes and configurable levels
 
 import os
 import sys
+import threading
 from enum import Enum
-from typing import Optional
+from typing import Iterable, Optional
+
+
+# Shared by every writer to stdout/stderr (including streamed aztfexport output) so that
+# lines from concurrent exports are written whole and never interleave
+output_lock = threading.RLock()
 
 
 class LogLevel(Enum):
@@ -32,30 +38,48 @@ class Logger:
         """Check if message should be logged based on current level"""
         return message_level.value >= self.level.value
     
-    def debug(self, message: str):
+    @staticmethod
+    def _format(message: str, args: tuple) -> str:
+        """Apply %-style arguments (only called once the message is known to be emitted)"""
+        return message % args if args else message
+    
+    @staticmethod
+    def _write(text: str, stream=None):
+        """Write one or more complete lines to the stream in a single call under the output lock"""
+        stream = stream or sys.stdout
+        with output_lock:
+            stream.write(text + '\n')
+            stream.flush()
+    
+    def debug(self, message: str, *args):
         """Log debug message"""
         if self._should_log(LogLevel.DEBUG):
-            print(f"[DEBUG] {message}", file=sys.stderr)
+            self._write(f"[DEBUG] {self._format(message, args)}", sys.stderr)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log info message"""
         if self._should_log(LogLevel.INFO):
-            print(f"[INFO]  {message}")
+            self._write(f"[INFO]  {self._format(message, args)}")
+    
+    def info_lines(self, lines: Iterable[str]):
+        """Log several info lines with a single write (lines are only built if INFO is enabled)"""
+        if self._should_log(LogLevel.INFO):
+            self._write('\n'.join(f"[INFO]  {line}" for line in lines))
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
         if self._should_log(LogLevel.ERROR):
-            print(f"[ERROR] {message}", file=sys.stderr)
+            self._write(f"[ERROR] {self._format(message, args)}", sys.stderr)
     
-    def success(self, message: str):
+    def success(self, message: str, *args):
         """Log success message (info level)"""
         if self._should_log(LogLevel.INFO):
-            print(f"[INFO]  ✓ {message}")
+            self._write(f"[INFO]  ✓ {self._format(message, args)}")
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message (info level)"""
         if self._should_log(LogLevel.INFO):
-            print(f"[INFO]  ⚠️  {message}")
+            self._write(f"[INFO]  ⚠️  {self._format(message, args)}")
 
 
 # Global logger instance
@@ -6,13 +6,16 @@ import os
 import sys
 import json
 import subprocess
+import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Any
 from dotenv import load_dotenv
 
-from export_manager import ExportManager
+from export_manager import ExportManager, terminate_running_exports
 from log_analytics import LogAnalyticsSender
-from logger import get_logger
+from logger import get_logger, output_lock
 
 
 def main():
@@ -87,15 +90,7 @@ def main():
         logger.error("No subscriptions found. Check Azure CLI authentication and permissions.")
         sys.exit(1)
     
-    exclude_subscriptions_raw = export_manager.config.get('exclude_subscriptions', {})
-    # Flatten prod and non-prod lists into single list
-    if isinstance(exclude_subscriptions_raw, dict):
-        prod_list = exclude_subscriptions_raw.get('prod') or []
-        non_prod_list = exclude_subscriptions_raw.get('non-prod') or []
-        exclude_subscriptions = (prod_list if isinstance(prod_list, list) else []) + (non_prod_list if isinstance(non_prod_list, list) else [])
-    else:
-        # Backward compatibility: if it's a list, use it directly
-        exclude_subscriptions = exclude_subscriptions_raw if isinstance(exclude_subscriptions_raw, list) else []
+    exclude_subscriptions = export_manager.get_exclude_subscriptions()
     create_rg_folders = export_manager.config.get('output', {}).get('create_rg_folders', True)
     
     # Separate subscriptions into excluded and to-be-processed
@@ -126,15 +121,17 @@ def main():
     
     if excluded_subs:
         logger.info(f"Excluded subscriptions ({len(excluded_subs)}):")
-        for sub_name, sub_id, pattern in excluded_subs:
-            logger.info(f"  ✗ {sub_name} (ID: {sub_id}) - matched exclude pattern: {pattern}")
+        logger.info_lines(
+            f"  ✗ {sub_name} (ID: {sub_id}) - matched exclude pattern: {pattern}"
+            for sub_name, sub_id, pattern in excluded_subs
+        )
     
     if subscriptions_to_process:
         logger.info(f"Subscriptions to process ({len(subscriptions_to_process)}):")
-        for sub in subscriptions_to_process:
-            sub_name = sub.get('name', sub.get('id'))
-            sub_id = sub.get('id')
-            logger.info(f"  ✓ {sub_name} (ID: {sub_id})")
+        logger.info_lines(
+            f"  ✓ {sub.get('name', sub.get('id'))} (ID: {sub.get('id')})"
+            for sub in subscriptions_to_process
+        )
     
     total_subs = len(subscriptions)
     logger.success(f"Found {total_subs} total subscription(s): {len(subscriptions_to_process)} to process, {len(excluded_subs)} excluded")
@@ -156,11 +153,15 @@ def main():
         logger.warning("   Continuing anyway, but exports may fail if disk fills up.")
         logger.info("")
     
-    results = {}
+    export_manager.prefetch_resource_groups(subscriptions_to_process)
     
-    for sub in subscriptions_to_process:
+    parallel = export_manager.max_parallel_subscriptions > 1 and len(subscriptions_to_process) > 1
+    
+    def process_subscription(sub: Dict[str, Any]) -> Dict[str, Any]:
+        """Export one subscription, push it to git if enabled and report its status"""
         subscription_id = sub.get('id')
         subscription_name = sub.get('name', subscription_id)
+        output_prefix = f"[{subscription_name}] " if parallel else ''
         
         start_time = datetime.utcnow()
         subscription_result = None
@@ -173,8 +174,7 @@ def main():
             logger.info(f"Processing subscription: {subscription_name}")
             logger.info("=" * 70)
             
-            subscription_result = export_manager.export_subscription(sub, create_rg_folders)
-            results[subscription_id] = subscription_result
+            subscription_result = export_manager.export_subscription(sub, create_rg_folders, output_prefix)
             end_time = datetime.utcnow()
             
             if subscription_result.get('successful_rgs', 0) > 0:
@@ -238,10 +238,11 @@ def main():
             end_time = datetime.utcnow()
             error_message = str(e)
             logger.error(f"Fatal error exporting subscription {subscription_id}: {error_message}")
-            import traceback
-            traceback.print_exc()
+            # Under the logger's lock, so it doesn't interleave with other subscriptions' output
+            with output_lock:
+                traceback.print_exc()
             
-            results[subscription_id] = {
+            subscription_result = {
                 'subscription_id': subscription_id,
                 'subscription_name': subscription_name,
                 'error': error_message
@@ -264,6 +265,27 @@ def main():
                 logger.warning(f"Failed to send failure status to Log Analytics for {subscription_name}: {str(la_error)}")
             
             logger.warning(f"Continuing with next subscription after error in {subscription_name}")
+        
+        export_manager.record_subscription_result(subscription_result)
+        return subscription_result
+    
+    if parallel:
+        # Exports pass --subscription-id explicitly, so subscriptions can run concurrently
+        # without switching the Azure CLI's current account; git pushes are serialized
+        logger.info(f"Exporting up to {export_manager.max_parallel_subscriptions} subscriptions in parallel")
+        with ThreadPoolExecutor(max_workers=export_manager.max_parallel_subscriptions) as executor:
+            try:
+                outcomes = list(executor.map(process_subscription, subscriptions_to_process))
+            except BaseException:
+                # Workers never see Ctrl-C: drop queued subscriptions and kill running exports
+                # before the pool waits for its threads
+                executor.shutdown(wait=False, cancel_futures=True)
+                terminate_running_exports()
+                raise
+    else:
+        outcomes = [process_subscription(sub) for sub in subscriptions_to_process]
+    
+    results = {sub.get('id'): result for sub, result in zip(subscriptions_to_process, outcomes)}
     
     if not results:
         logger.error("No subscriptions were exported. Check your configuration.")
@@ -278,18 +300,25 @@ def main():
     successful_subs = sum(1 for r in results.values() if r.get('successful_rgs', 0) > 0)
     total_rgs = sum(r.get('total_rgs', 0) for r in results.values())
     successful_rgs = sum(r.get('successful_rgs', 0) for r in results.values())
+    skipped_rgs = sum(r.get('skipped_rgs', 0) for r in results.values())
     
     logger.info(f"Subscriptions processed: {total_subs}")
     logger.info(f"Subscriptions with successful exports: {successful_subs}")
     logger.info(f"Total resource groups: {total_rgs}")
     logger.info(f"Successfully exported: {successful_rgs}")
-    logger.info(f"Failed: {total_rgs - successful_rgs}")
+    logger.info(f"Failed: {total_rgs - successful_rgs - skipped_rgs}")
+    if skipped_rgs:
+        logger.info(f"Skipped (empty): {skipped_rgs}")
     
     results_file = Path(export_manager.base_dir) / 'export_results.json'
-    with open(results_file, 'w') as f:
-        json.dump(results, f, indent=2, default=str)
+    # Serialize once and write in a single call rather than json.dump's many small writes
+    results_file.write_text(json.dumps(results, indent=2, default=str))
     logger.success(f"Export results saved to: {results_file}")
     
+    # Nothing left to resume once every resource group has been exported
+    if not any(r.get('error') or r.get('failed_rgs') for r in results.values()):
+        export_manager.discard_checkpoint()
+    
     logger.info("")
     logger.info("=" * 70)
     logger.info("Export completed!")
@@ -305,15 +334,17 @@ if __name__ == "__main__":
     try:
         main()
     except KeyboardInterrupt:
+        terminate_running_exports()
         logger = get_logger()
         logger.info("")
         logger.info("Export cancelled by user")
         sys.exit(1)
     except Exception as e:
+        terminate_running_exports()
         logger = get_logger()
         logger.error("")
         logger.error(f"Error: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        with output_lock:
+            traceback.print_exc()
         sys.exit(1)
 